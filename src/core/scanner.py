@@ -2,12 +2,21 @@ import ast
 import os
 import pathlib
 import json
-from typing import Dict, List, Set, Optional, Any
+import sys
+from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from collections import defaultdict
 import hashlib
 import logging
 
+try:
+    from ..utils.common import EXCLUDED_DIRS, EXCLUDED_DIR_SUFFIXES
+except ImportError:
+    # Run as a script or imported as a top-level module (scanner, core.*):
+    # put src on the path so the shared utils package resolves
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.common import EXCLUDED_DIRS, EXCLUDED_DIR_SUFFIXES
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +48,12 @@ LANGUAGE_EXTENSIONS = {
     'SQL': ['.sql'],
 }
 
+# AST nodes that add a decision point to cyclomatic complexity
+_DECISION_NODES = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith,
+    ast.Try, ast.ExceptHandler, ast.BoolOp, ast.comprehension,
+)
+
 @dataclass
 class FileMetadata:
     pass
@@ -51,6 +66,7 @@ class FileMetadata:
     functions: List[Dict[str, Any]] = field(default_factory=list)
     classes: List[Dict[str, Any]] = field(default_factory=list)
     complexity_score: float = 0.0
+    mtime_ns: int = 0
     
     def to_dict(self) -> Dict:
         return asdict(self)
@@ -74,15 +90,25 @@ class ProjectStructure:
             'files': [f.to_dict() for f in self.files],
             'dependency_graph': self.dependency_graph
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProjectStructure':
+        return cls(
+            root_path=data['root_path'],
+            total_files=data.get('total_files', 0),
+            total_lines=data.get('total_lines', 0),
+            languages=data.get('languages', {}),
+            files=[FileMetadata(**f) for f in data.get('files', [])],
+            dependency_graph=data.get('dependency_graph', {})
+        )
 
 class PulseScanner:
     pass
     
     # Files and directories to exclude from scanning
     EXCLUDE_PATTERNS = {
-        '__pycache__', '.git', '.svn', '.hg', 'node_modules',
-        '.venv', 'venv', 'env', '.idea', '.vscode', 'dist',
-        'build', '*.pyc', '*.pyo', '*.egg-info', '.DS_Store'
+        *EXCLUDED_DIRS, *('*' + suffix for suffix in EXCLUDED_DIR_SUFFIXES),
+        '*.pyc', '*.pyo', '.DS_Store'
     }
     
     # Supported file extensions and their languages
@@ -137,12 +163,49 @@ class PulseScanner:
         '.sql': 'SQL',
     }
     
+    # Well-known source files that carry no extension
+    FILENAME_MAP = {
+        'Dockerfile': 'Dockerfile',
+        'Makefile': 'Makefile',
+        'Rakefile': 'Ruby',
+        'Gemfile': 'Ruby',
+        'Jenkinsfile': 'Groovy',
+    }
+    
+    # Interpreters recognised on a ``#!`` line
+    SHEBANG_MAP = {
+        'python': 'Python',
+        'sh': 'Shell',
+        'bash': 'Shell',
+        'zsh': 'Shell',
+        'node': 'JavaScript',
+        'ruby': 'Ruby',
+        'php': 'PHP',
+    }
+    
+    # Files larger than this only get minimal metadata (no line count, hash or AST)
+    MAX_SCAN_SIZE = 5 * 1024 * 1024
+    
+    # Bytes peeked to sniff shebangs, binary content and minified bundles
+    PEEK_SIZE = 4096
+    
+    # Average line length above which JS/TS is treated as minified; smaller
+    # files are always scanned, so hand-written one-liners are not skipped
+    MINIFIED_LINE_LENGTH = 500
+    MINIFIED_MIN_SIZE = 4 * 1024
+    
+    # Initial size of the shared read buffer; grows for larger files
+    READ_BUFFER_SIZE = 2 * 1024 * 1024
+    
     def __init__(self, root_path: str, max_depth: int = 10, follow_symlinks: bool = False):
         self.root_path = pathlib.Path(root_path).resolve()
         self.max_depth = max_depth
         self.follow_symlinks = follow_symlinks
         self.structure = ProjectStructure(root_path=str(self.root_path))
         
+        # One buffer reused for every file instead of a fresh read per file
+        self._buf = bytearray(self.READ_BUFFER_SIZE)
+        
         logger.info(f"Initialized scanner for: {self.root_path}")
     
     def should_exclude(self, path: pathlib.Path) -> bool:
@@ -157,6 +220,62 @@ class PulseScanner:
                     return True
         return False
     
+    def _peek(self, file_path: pathlib.Path) -> bytes:
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read(self.PEEK_SIZE)
+        except OSError:
+            return b""
+    
+    def detect_language(self, file_path: pathlib.Path) -> Optional[str]:
+        language = self.LANGUAGE_MAP.get(file_path.suffix)
+        if language:
+            return language
+        
+        language = self.FILENAME_MAP.get(file_path.name)
+        if language:
+            return language
+        
+        # Only extensionless files are worth sniffing for a shebang
+        if file_path.suffix:
+            return None
+        
+        head = self._peek(file_path)
+        if not head.startswith(b'#!') or b'\0' in head:
+            return None
+        
+        parts = head[2:].split(b'\n', 1)[0].decode('ascii', 'ignore').split()
+        if not parts:
+            return None
+        
+        interpreter = os.path.basename(parts[0])
+        if interpreter == 'env' and len(parts) > 1:
+            interpreter = parts[1]
+        
+        # python3.11 -> python
+        return self.SHEBANG_MAP.get(interpreter.rstrip('0123456789.'))
+    
+    def is_minified(self, head: bytes) -> bool:
+        if not head:
+            return False
+        
+        line_count = head.count(b'\n') + 1
+        return len(head) / line_count > self.MINIFIED_LINE_LENGTH
+    
+    def _read_into_buffer(self, file_path: pathlib.Path, size_hint: int) -> int:
+        if size_hint >= len(self._buf):
+            self._buf = bytearray(size_hint + 1)
+        
+        with open(file_path, 'rb') as f:
+            size = f.readinto(self._buf)
+            if size == len(self._buf):
+                # File grew after stat(); append whatever is left
+                rest = f.read()
+                self._buf[size:] = rest
+                size += len(rest)
+        
+        return size
+    
     def calculate_file_hash(self, file_path: pathlib.Path) -> str:
         sha256_hash = hashlib.sha256()
         try:
@@ -169,7 +288,7 @@ class PulseScanner:
             logger.warning(f"Could not hash file {file_path}: {e}")
             return ""
     
-    def analyze_python_ast(self, file_path: pathlib.Path) -> Dict[str, Any]:
+    def analyze_python_ast(self, file_path: pathlib.Path, source: Optional[bytes] = None) -> Dict[str, Any]:
         result = {
             'imports': [],
             'functions': [],
@@ -178,11 +297,12 @@ class PulseScanner:
         }
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            if source is None:
+                with open(file_path, 'rb') as f:
+                    source = f.read()
             
-            # Parse the source code into an AST
-            tree = ast.parse(source_code, filename=str(file_path))
+            # Parse the source code into an AST (bytes honour PEP 263 encodings)
+            tree = ast.parse(source, filename=str(file_path))
             
             # Walk through the AST
             for node in ast.walk(tree):
@@ -205,9 +325,8 @@ class PulseScanner:
                     }
                     result['functions'].append(func_info)
                     
-                    result['complexity'] += sum(1 for _ in ast.walk(node) 
-                                               if isinstance(_, (ast.If, ast.For, ast.While, 
-                                                               ast.ExceptHandler, ast.With)))
+                    result['complexity'] += sum(1 for n in ast.walk(node)
+                                               if isinstance(n, _DECISION_NODES))
                 
                 # Extract class definitions
                 elif isinstance(node, ast.ClassDef):
@@ -238,17 +357,48 @@ class PulseScanner:
         
         return result
     
-    def scan_file(self, file_path: pathlib.Path) -> Optional[FileMetadata]:
+    def scan_file(self, file_path: pathlib.Path, language: Optional[str] = None) -> Optional[FileMetadata]:
         try:
             # Get file stats
             stat = file_path.stat()
             
-            # Count lines
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = sum(1 for _ in f)
+            # Determine language, unless the caller already did
+            if language is None:
+                language = self.detect_language(file_path) or 'Unknown'
+            
+            # Oversized files only get minimal metadata
+            if stat.st_size > self.MAX_SCAN_SIZE:
+                return FileMetadata(
+                    path=str(file_path.relative_to(self.root_path)),
+                    size=stat.st_size,
+                    lines=0,
+                    language=language,
+                    file_hash="",
+                    mtime_ns=stat.st_mtime_ns
+                )
+            
+            size = self._read_into_buffer(file_path, stat.st_size)
+            view = memoryview(self._buf)[:size]
             
-            # Determine language
-            language = self.LANGUAGE_MAP.get(file_path.suffix, 'Unknown')
+            # Minified bundles are not worth counting lines for
+            if (language in ('JavaScript', 'TypeScript') and size >= self.MINIFIED_MIN_SIZE
+                    and self.is_minified(bytes(view[:self.PEEK_SIZE]))):
+                return FileMetadata(
+                    path=str(file_path.relative_to(self.root_path)),
+                    size=stat.st_size,
+                    lines=0,
+                    language=f"{language} (minified)",
+                    file_hash=hashlib.sha256(view).hexdigest(),
+                    mtime_ns=stat.st_mtime_ns
+                )
+            
+            # Count lines straight from the buffer, as text mode would: \n, \r\n
+            # and a lone \r each end a line, plus an unterminated last line
+            lines = self._buf.count(b'\n', 0, size)
+            if self._buf.find(b'\r', 0, size) != -1:
+                lines += self._buf.count(b'\r', 0, size) - self._buf.count(b'\r\n', 0, size)
+            if size and self._buf[size - 1] not in b'\r\n':
+                lines += 1
             
             # Create metadata object
             metadata = FileMetadata(
@@ -256,12 +406,13 @@ class PulseScanner:
                 size=stat.st_size,
                 lines=lines,
                 language=language,
-                file_hash=self.calculate_file_hash(file_path)
+                file_hash=hashlib.sha256(view).hexdigest(),
+                mtime_ns=stat.st_mtime_ns
             )
             
             # Perform deep analysis for Python files
-            if file_path.suffix == '.py':
-                analysis = self.analyze_python_ast(file_path)
+            if language == 'Python':
+                analysis = self.analyze_python_ast(file_path, source=bytes(view))
                 metadata.imports = analysis['imports']
                 metadata.functions = analysis['functions']
                 metadata.classes = analysis['classes']
@@ -274,31 +425,37 @@ class PulseScanner:
             return None
     
     def build_dependency_graph(self) -> Dict[str, List[str]]:
-        graph = defaultdict(list)
+        paths, adjacency = self._build_adjacency()
         
-        # Create a map of module names to file paths
-        module_to_file = {}
-        for file_meta in self.structure.files:
-            if file_meta.language == 'Python':
-                module_name = file_meta.path.replace('/', '.').replace('.py', '')
-                module_to_file[module_name] = file_meta.path
+        # Convert integer ids back to paths only at serialization time
+        return {
+            paths[src]: [paths[dst] for dst in targets]
+            for src, targets in adjacency.items()
+        }
+    
+    def _build_adjacency(self) -> Tuple[List[str], Dict[int, List[int]]]:
+        python_files = [f for f in self.structure.files if f.language == 'Python']
+        
+        # Give every Python file an integer id so edges are plain ints
+        paths = [f.path for f in python_files]
+        module_ids = {
+            path.replace('/', '.').replace('.py', ''): file_id
+            for file_id, path in enumerate(paths)
+        }
         
         # Build the graph
-        for file_meta in self.structure.files:
-            if file_meta.language == 'Python':
-                for import_name in file_meta.imports:
-                    if import_name in module_to_file:
-                        graph[file_meta.path].append(module_to_file[import_name])
+        adjacency = {}
+        for file_id, file_meta in enumerate(python_files):
+            targets = [module_ids[m] for m in file_meta.imports if m in module_ids]
+            if targets:
+                adjacency[file_id] = targets
         
-        return dict(graph)
+        return paths, adjacency
     
-    def scan(self) -> ProjectStructure:
-        logger.info(f"Starting scan of {self.root_path}")
-        
-        # Track statistics
-        language_counts = defaultdict(int)
-        
-        # Recursively scan all files
+    def _iter_files(self):
+        # Recursively yield (path, language) for every supported, non-excluded
+        # file; the language is passed on so extensionless files are only
+        # sniffed for a shebang once
         for root, dirs, files in os.walk(self.root_path, followlinks=self.follow_symlinks):
             current_path = pathlib.Path(root)
             
@@ -314,7 +471,6 @@ class PulseScanner:
             # Filter out excluded directories
             dirs[:] = [d for d in dirs if not self.should_exclude(current_path / d)]
             
-            # Scan each file
             for filename in files:
                 file_path = current_path / filename
                 
@@ -322,15 +478,25 @@ class PulseScanner:
                     continue
                 
                 # Check if it's a supported file type
-                if file_path.suffix not in self.LANGUAGE_MAP:
+                language = self.detect_language(file_path)
+                if language is None:
                     continue
                 
-                # Scan the file
-                metadata = self.scan_file(file_path)
-                if metadata:
-                    self.structure.files.append(metadata)
-                    self.structure.total_lines += metadata.lines
-                    language_counts[metadata.language] += 1
+                yield file_path, language
+    
+    def scan(self) -> ProjectStructure:
+        logger.info(f"Starting scan of {self.root_path}")
+        
+        # Track statistics
+        language_counts = defaultdict(int)
+        
+        # Scan each file
+        for file_path, language in self._iter_files():
+            metadata = self.scan_file(file_path, language)
+            if metadata:
+                self.structure.files.append(metadata)
+                self.structure.total_lines += metadata.lines
+                language_counts[metadata.language] += 1
         
         # Update structure with aggregated data
         self.structure.total_files = len(self.structure.files)
@@ -342,10 +508,68 @@ class PulseScanner:
         
         return self.structure
     
+    def rescan(self, prev: ProjectStructure) -> ProjectStructure:
+        logger.info(f"Starting incremental scan of {self.root_path}")
+        
+        self.structure = ProjectStructure(root_path=str(self.root_path))
+        by_path = {fm.path: fm for fm in prev.files}
+        language_counts = defaultdict(int)
+        reused = 0
+        graph_changed = False
+        
+        for file_path, language in self._iter_files():
+            old = by_path.pop(str(file_path.relative_to(self.root_path)), None)
+            
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.warning(f"Could not stat {file_path}: {e}")
+                stat = None
+            
+            # Unchanged size and mtime: keep the previous metadata as is
+            if old and stat and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+                metadata = old
+                reused += 1
+            else:
+                metadata = self.scan_file(file_path, language)
+                
+                # The graph only depends on which Python files exist and what they import
+                was_python = old is not None and old.language == 'Python'
+                is_python = metadata is not None and metadata.language == 'Python'
+                if was_python != is_python or (is_python and old.imports != metadata.imports):
+                    graph_changed = True
+            
+            if metadata:
+                self.structure.files.append(metadata)
+                self.structure.total_lines += metadata.lines
+                language_counts[metadata.language] += 1
+        
+        # Python files that disappeared since the previous scan
+        if any(fm.language == 'Python' for fm in by_path.values()):
+            graph_changed = True
+        
+        # Update structure with aggregated data
+        self.structure.total_files = len(self.structure.files)
+        self.structure.languages = dict(language_counts)
+        if graph_changed:
+            self.structure.dependency_graph = self.build_dependency_graph()
+        else:
+            self.structure.dependency_graph = prev.dependency_graph
+        
+        logger.info(f"Incremental scan complete: {self.structure.total_files} files, "
+                   f"{reused} unchanged")
+        
+        return self.structure
+    
     def export_json(self, output_path: str) -> None:
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(self.structure.to_dict(), f, indent=2)
         logger.info(f"Exported scan results to {output_path}")
+    
+    @staticmethod
+    def load_json(input_path: str) -> ProjectStructure:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            return ProjectStructure.from_dict(json.load(f))
 
 def main():
     import sys
@@ -1,13 +1,26 @@
 import ast
+import hashlib
 import re
-from typing import List, Dict, Any, Set, Tuple
-from dataclasses import dataclass
-from collections import Counter, defaultdict
+import os
+import sys
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import List, Dict, Any, Set, Tuple, Optional, Callable, Union
+from dataclasses import InitVar, dataclass, field
 import math
 
-@dataclass
+try:
+    from ..utils.common import DATACLASS_SLOTS, run_batch
+    from ..utils.result_cache import ResultCache, config_key
+except ImportError:
+    # Run as a script or imported as a top-level module (scanner, core.*):
+    # put src on the path so the shared utils package resolves
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.common import DATACLASS_SLOTS, run_batch
+    from utils.result_cache import ResultCache, config_key
+
+@dataclass(**DATACLASS_SLOTS)
 class CodeSmell:
-    pass
     name: str
     severity: str  # CRITICAL, HIGH, MEDIUM, LOW
     category: str  # Complexity, Coupling, Cohesion, Size, etc.
@@ -16,11 +29,380 @@ class CodeSmell:
     line: int
     impact: str
     refactoring_suggestion: str
-    code_example: str = ""
+    # A ready string or a factory; factories only run when someone reads
+    # code_example, and the result replaces them
+    code_example: InitVar[Union[str, Callable[[], str], None]] = ""
+    _code_example: Union[str, Callable[[], str], None] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self, code_example):
+        self._code_example = code_example
+
+def _lazy_code_example(smell: CodeSmell) -> str:
+    example = smell._code_example
+    if example is None:
+        return ""
+    if not isinstance(example, str):
+        example = smell._code_example = example()
+    return example
+
+# code_example is also the init keyword, so its property can only replace
+# the InitVar default once the dataclass is built
+CodeSmell.code_example = property(_lazy_code_example)
+
+def _walk_interesting(root: ast.AST, types: frozenset):
+    # Explicit-stack replacement for ast.walk (depth-first, no deque or nested
+    # generators) that only yields nodes of the given types; every other node
+    # is expanded without resuming the consumer. Children are pushed in
+    # reverse so they are popped, and yielded, in source order. Leaf nodes
+    # (names, constants, expression contexts) are dropped without the
+    # per-node iter_child_nodes call
+    iter_child_nodes = ast.iter_child_nodes
+    leaf_nodes = _LEAF_NODES
+    stack = [root]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        node_type = type(node)
+        if node_type in types:
+            yield node
+        elif node_type in leaf_nodes:
+            continue
+        children = list(iter_child_nodes(node))
+        children.reverse()
+        extend(children)
+
+_SCOPE_NODES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+
+# Nodes that can never contain an Attribute or a scope, so neither walk
+# expands them (expression contexts hang off every Name and Attribute)
+_LEAF_NODES = frozenset((ast.Name, ast.Constant, ast.Load, ast.Store, ast.Del))
+
+# Methods that do not count towards a class doing real work
+_TRIVIAL_METHODS = frozenset(('__init__', '__str__', '__repr__'))
+
+def _scan_function_attrs(root: ast.AST) -> Tuple[int, int, Dict[str, int]]:
+    # Count self vs other attribute access in one walk of the body. The walk
+    # is inlined rather than a generator, stops at nested functions and
+    # classes (their bodies belong to their own checks), and only follows
+    # the value of an Attribute. Children are pushed in reverse so owners
+    # are first seen, and reported, in source order
+    self_access = 0
+    foreign_access = 0
+    other_access = {}
+    
+    iter_child_nodes = ast.iter_child_nodes
+    scope_nodes = _SCOPE_NODES
+    leaf_nodes = _LEAF_NODES
+    Attribute = ast.Attribute
+    Name = ast.Name
+    stack = list(iter_child_nodes(root))
+    stack.reverse()
+    pop = stack.pop
+    push = stack.append
+    extend = stack.extend
+    while stack:
+        node = pop()
+        node_type = type(node)
+        if node_type is Attribute:
+            value = node.value
+            if type(value) is Name:
+                owner = value.id
+                if owner == 'self':
+                    self_access += 1
+                else:
+                    foreign_access += 1
+                    other_access[owner] = other_access.get(owner, 0) + 1
+            else:
+                push(value)
+        elif node_type not in leaf_nodes and node_type not in scope_nodes:
+            children = list(iter_child_nodes(node))
+            children.reverse()
+            extend(children)
+    
+    return self_access, foreign_access, other_access
+
+# Example builders are module-level functions bound with partial, so smells
+# stay picklable when they come back from worker processes
+def _long_method_example(name: str, length: int) -> str:
+    return (
+        f"# Current: {length} lines\ndef {name}(...):\n    ...\n\n"
+        f"# Better: delegate to focused helpers\ndef {name}(...):\n"
+        f"    data = _prepare(...)\n    return _process(data)"
+    )
+
+def _long_parameter_list_example(name: str, count: int) -> str:
+    return (
+        f"# Current: {count} parameters\ndef {name}(a, b, c, d, e, f, g):\n\n"
+        f"# Better: group related values\ndef {name}(options: Options):"
+    )
+
+def _intimacy_example() -> str:
+    return "Use getters/setters or proper method calls"
+
+def _feature_envy_example(name: str, other: str) -> str:
+    return (
+        f"# Current\ndef {name}(self, {other}):\n    return {other}.a + {other}.b\n\n"
+        f"# Better: let '{other}' own the behaviour\n{other}.{name}()"
+    )
+
+def _large_class_example(name: str, count: int) -> str:
+    return (
+        f"# Current: {name} with {count} methods\n\n"
+        f"# Better: one class per responsibility\nclass {name}Reader: ...\n"
+        f"class {name}Writer: ..."
+    )
+
+def _divergent_change_example(name: str, ops: frozenset) -> str:
+    return (
+        f"# Split {name} by responsibility\n"
+        + "\n".join(f"class {name}{op.title()}: ..." for op in sorted(ops))
+    )
+
+def _lazy_class_example(name: str) -> str:
+    return f"# Inline {name} into its callers, or merge it into a related class"
+
+# Detection records each smell as a compact tuple
+# (rule, severity, line, *params); CodeSmell records are only built from
+# these when somebody asks for them
+_RULE_LONG_METHOD = 0
+_RULE_LONG_PARAMETER_LIST = 1
+_RULE_INAPPROPRIATE_INTIMACY = 2
+_RULE_FEATURE_ENVY = 3
+_RULE_LARGE_CLASS = 4
+_RULE_DIVERGENT_CHANGE = 5
+_RULE_LAZY_CLASS = 6
+_RULE_HUGE_FILE = 7
+
+# Fixed text for each rule as (name, category, impact, refactoring
+# suggestion), shared by every smell of that rule; a "{}" in the suggestion
+# is filled from _format_suggestion
+def _rule_text(name: str, category: str, impact: str, suggestion: str) -> Tuple[str, str, str, str]:
+    # Names and categories are grouped and compared in reports; interning
+    # makes every smell share one object per value, including "OO Abuser"
+    # and "Change Preventer", which are not identifier-like and so are not
+    # interned automatically
+    return sys.intern(name), sys.intern(category), impact, suggestion
+
+_LONG_METHOD = _rule_text(
+    "Long Method", "Bloater",
+    "Difficult to understand and maintain. Higher bug probability.",
+    "Extract smaller methods. Aim for < {} lines per function.",
+)
+_LONG_PARAMETER_LIST = _rule_text(
+    "Long Parameter List", "Bloater",
+    "Hard to call, understand, and maintain.",
+    "Use parameter objects or configuration classes.",
+)
+_INAPPROPRIATE_INTIMACY = _rule_text(
+    "Inappropriate Intimacy", "OO Abuser",
+    "Tight coupling. Changes in one class break another.",
+    "Use proper encapsulation. Add methods instead of accessing fields.",
+)
+_FEATURE_ENVY = _rule_text(
+    "Feature Envy", "Coupler",
+    "Method is in the wrong class. Poor cohesion.",
+    "Move this method to the '{}' class.",
+)
+_LARGE_CLASS = _rule_text(
+    "Large Class", "Bloater",
+    "Violates Single Responsibility Principle. Hard to maintain.",
+    "Split into smaller, focused classes.",
+)
+_DIVERGENT_CHANGE = _rule_text(
+    "Divergent Change", "Change Preventer",
+    "Changes for different reasons. Hard to maintain.",
+    "Split into separate classes, each with one responsibility.",
+)
+_LAZY_CLASS = _rule_text(
+    "Lazy Class", "Dispensable",
+    "Unnecessary abstraction. Adds complexity without value.",
+    "Remove class and inline functionality, or add more behavior.",
+)
+_HUGE_FILE = _rule_text(
+    "Huge File", "Bloater",
+    "Too large to navigate or review. Usually generated or vendored code.",
+    "Split the module, or exclude generated files from analysis.",
+)
+
+# Indexed by rule id
+_RULE_TEXT = (
+    _LONG_METHOD, _LONG_PARAMETER_LIST, _INAPPROPRIATE_INTIMACY, _FEATURE_ENVY,
+    _LARGE_CLASS, _DIVERGENT_CHANGE, _LAZY_CLASS, _HUGE_FILE,
+)
+_RULE_CATEGORY = tuple(text[1] for text in _RULE_TEXT)
+
+@lru_cache(maxsize=1024)
+def _format_suggestion(template: str, value: Any) -> str:
+    # Smells with the same threshold or target class share one string
+    return template.format(value)
+
+def _long_method_smell(file_path, severity, line, name, length, threshold):
+    smell_name, category, impact, suggestion = _LONG_METHOD
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Function '{name}' is {length} lines long",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=_format_suggestion(suggestion, threshold),
+        code_example=partial(_long_method_example, name, length)
+    )
+
+def _long_parameter_list_smell(file_path, severity, line, name, param_count):
+    smell_name, category, impact, suggestion = _LONG_PARAMETER_LIST
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Function '{name}' has {param_count} parameters",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion,
+        code_example=partial(_long_parameter_list_example, name, param_count)
+    )
+
+def _inappropriate_intimacy_smell(file_path, severity, line, name, foreign_access):
+    smell_name, category, impact, suggestion = _INAPPROPRIATE_INTIMACY
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Function '{name}' accesses other objects' internals {foreign_access} times",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion,
+        code_example=_intimacy_example
+    )
+
+def _feature_envy_smell(file_path, severity, line, name, other_obj):
+    smell_name, category, impact, suggestion = _FEATURE_ENVY
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Function '{name}' uses '{other_obj}' more than 'self'",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=_format_suggestion(suggestion, other_obj),
+        code_example=partial(_feature_envy_example, name, other_obj)
+    )
+
+def _large_class_smell(file_path, severity, line, name, size, method_count):
+    smell_name, category, impact, suggestion = _LARGE_CLASS
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Class '{name}' has {size} lines and {method_count} methods",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion,
+        code_example=partial(_large_class_example, name, method_count)
+    )
+
+def _divergent_change_smell(file_path, severity, line, name, operation_types):
+    smell_name, category, impact, suggestion = _DIVERGENT_CHANGE
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Class '{name}' handles {len(operation_types)} different responsibilities",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion,
+        code_example=partial(_divergent_change_example, name, operation_types)
+    )
+
+def _lazy_class_smell(file_path, severity, line, name, real_count):
+    smell_name, category, impact, suggestion = _LAZY_CLASS
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"Class '{name}' only has {real_count} method(s)",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion,
+        code_example=partial(_lazy_class_example, name)
+    )
+
+def _huge_file_smell(file_path, severity, line, name, size, limit):
+    smell_name, category, impact, suggestion = _HUGE_FILE
+    return CodeSmell(
+        name=smell_name,
+        severity=severity,
+        category=category,
+        description=f"File '{name}' is {size} bytes, over the {limit} byte limit; not analyzed",
+        location=file_path,
+        line=line,
+        impact=impact,
+        refactoring_suggestion=suggestion
+    )
+
+# Indexed by rule id
+_MATERIALIZERS = (
+    _long_method_smell,
+    _long_parameter_list_smell,
+    _inappropriate_intimacy_smell,
+    _feature_envy_smell,
+    _large_class_smell,
+    _divergent_change_smell,
+    _lazy_class_smell,
+    _huge_file_smell,
+)
+
+def _smell_to_dict(s: CodeSmell) -> Dict[str, Any]:
+    return {
+        'name': s.name,
+        'severity': s.severity,
+        'category': s.category,
+        'description': s.description,
+        'line': s.line,
+        'impact': s.impact,
+        'refactoring': s.refactoring_suggestion
+    }
+
+def _materialize(file_path: str, raw: List[tuple]) -> List[CodeSmell]:
+    # Rows unpickled from workers or the disk cache carry their own copies
+    # of the severity strings; interning folds them back to one object each
+    materializers = _MATERIALIZERS
+    intern = sys.intern
+    return [materializers[r[0]](file_path, intern(r[1]), *r[2:]) for r in raw]
+
+# Method-name categories, one group per category in priority order; the
+# lookahead reports every keyword occurrence, overlapping ones included, in
+# a single left-to-right scan of the name
+_OP_RE = re.compile(
+    r'(?=(?:(get|set)|(save|load|read|write)|(validate|check)'
+    r'|(calculate|compute)|(format|render|display)))'
+)
+_OP_NAMES = ('accessors', 'persistence', 'validation', 'computation', 'presentation')
+
+@lru_cache(maxsize=4096)
+def _classify_method_name(name: str) -> Optional[str]:
+    # The lowest group number among the hits is the highest-priority category
+    groups = [m.lastindex for m in _OP_RE.finditer(name.lower())]
+    return _OP_NAMES[min(groups) - 1] if groups else None
 
 class IntelligentSmellDetector:
     pass
     
+    # One detector per worker can be alive for a whole project scan; slots
+    # keep instances small and attribute access direct
+    __slots__ = (
+        'metrics', 'cache_dir', '_file_path', '_raw', '_smells',
+        '_std_modules', '_std_owner_cache', '_config_key',
+    )
+    
     STANDARD_MODULES = {
         'sys', 'os', 'ast', 're', 'json', 'time', 'datetime', 'pathlib',
         'logging', 'typing', 'collections', 'itertools', 'functools',
@@ -36,311 +418,406 @@ class IntelligentSmellDetector:
     LARGE_CLASS_THRESHOLD = 500  # More realistic (was 200)
     LONG_PARAMETER_LIST = 6  # Reasonable (was 5)
     
-    def __init__(self):
-        self.smells = []
+    # Health score penalty per smell of each severity
+    SEVERITY_PENALTY = {'CRITICAL': 15, 'HIGH': 10, 'MEDIUM': 5, 'LOW': 2}
+    
+    # (raw smells, metrics) per file content, shared by all detectors
+    RESULT_CACHE_SIZE = 256
+    _result_cache = ResultCache(RESULT_CACHE_SIZE)
+    
+    # Bump when the raw tuple layout or the rules change, so results stored
+    # on disk by older versions are ignored
+    RESULT_CACHE_VERSION = 1
+    
+    # Files larger than this get a single "Huge File" smell instead of being
+    # parsed
+    MAX_FILE_BYTES = 1024 * 1024
+    
+    # Generated sources are skipped without being read
+    GENERATED_SUFFIXES = ('_pb2.py', '_pb2_grpc.py', '_pb2.pyi')
+    
+    
+    def __init__(self, cache_dir: Optional[str] = None):
         self.metrics = {}
         
+        # Where results are also stored on disk, e.g. ~/.cache/codepulse/smells
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        
+        # Raw smell tuples for the last file; self.smells builds CodeSmell
+        # records from them on first access
+        self._file_path = ''
+        self._raw = []
+        self._smells = None
+        
+        # Frozen per instance so subclasses can still override STANDARD_MODULES
+        self._std_modules = frozenset(name.lower() for name in self.STANDARD_MODULES)
+        
+        # owner name -> whether it is a standard module, so each distinct
+        # name is lowercased once rather than once per function
+        self._std_owner_cache = {}
+        
+        # Parsing differs between Python versions and results depend on the
+        # configured thresholds, so both are part of every cache key
+        config = (
+            self.RESULT_CACHE_VERSION, sys.version_info[:2],
+            self.LONG_METHOD_THRESHOLD, self.LARGE_CLASS_THRESHOLD, self.LONG_PARAMETER_LIST,
+            sorted(self._std_modules),
+        )
+        self._config_key = config_key(*config)
+        
+    @property
+    def smells(self) -> List[CodeSmell]:
+        if self._smells is None:
+            self._smells = _materialize(self._file_path, self._raw)
+        return self._smells
+    
     def detect_smells(self, file_path: str) -> List[CodeSmell]:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
+        self._detect_raw(file_path)
+        return self.smells
+    
+    def count_smells(self, file_path: str) -> int:
+        # Detection without building CodeSmell records; pair with
+        # get_smell_report(include_smells=False) for summaries
+        return len(self._detect_raw(file_path))
+    
+    def _set_result(self, file_path: str, raw: List[tuple], metrics: Dict[str, Any]) -> List[tuple]:
+        self._file_path = file_path
+        self._raw = raw
+        self._smells = None
+        self.metrics = dict(metrics)
+        return raw
+    
+    def _detect_raw(self, file_path: str) -> List[tuple]:
+        if file_path.endswith(self.GENERATED_SUFFIXES):
+            return self._set_result(file_path, [], {})
+        
+        # Oversized files are reported from their size alone; parsing them
+        # costs more than the result is worth
+        size = os.stat(file_path).st_size
+        if size > self.MAX_FILE_BYTES:
+            raw = [(_RULE_HUGE_FILE, 'MEDIUM', 1, os.path.basename(file_path), size, self.MAX_FILE_BYTES)]
+            return self._set_result(file_path, raw, {})
+        
+        # Work from the raw bytes: hashing and parsing need no decoded text
+        with open(file_path, 'rb') as f:
+            data = f.read()
         
+        # Content seen before, under any path, reuses the earlier result
+        code_hash = hashlib.sha256(data).hexdigest()
+        cached = self._result_cache.get(code_hash, self._config_key, self.cache_dir)
+        if cached is not None:
+            return self._set_result(file_path, *cached)
+        
+        # Type comments are never inspected, so the tokenizer can skip them
         try:
-            tree = ast.parse(code)
-        except:
-            return []
+            tree = ast.parse(data, filename=file_path, type_comments=False)
+        except (SyntaxError, ValueError):
+            return self._set_result(file_path, [], {})
         
-        # Calculate file-level metrics first
-        self._calculate_file_metrics(tree, code)
+        # Detect all smell types in a single traversal, collecting into a
+        # local list so results never leak between files
+        raw = []
+        function_lengths, class_sizes = self._run_all_detectors(tree, raw)
         
-        # Detect different types of smells
-        self._detect_bloater_smells(tree, file_path)
-        self._detect_oo_abuser_smells(tree, file_path)
-        self._detect_change_preventer_smells(tree, file_path)
-        self._detect_dispensable_smells(tree, file_path)
-        self._detect_coupler_smells(tree, file_path)
+        # File-level metrics reuse the lengths gathered during detection; the
+        # text is decoded once, only for line classification
+        code = data.decode('utf-8', 'replace')
+        metrics = self._calculate_file_metrics(code, function_lengths, class_sizes)
         
-        return self.smells
+        self._result_cache.put(code_hash, self._config_key, (raw, metrics), self.cache_dir)
+        
+        return self._set_result(file_path, raw, metrics)
     
-    def _calculate_file_metrics(self, tree: ast.AST, code: str):
+    def _calculate_file_metrics(self, code: str, functions: List[int], classes: List[int]) -> Dict[str, Any]:
         lines = code.split('\n')
         
-        self.metrics = {
+        # One pass keeps the first character of every non-blank line; the
+        # blank and comment counts then fall out of len() and list.count()
+        first_chars = [stripped[0] for stripped in map(str.lstrip, lines) if stripped]
+        blank_lines = len(lines) - len(first_chars)
+        comment_lines = first_chars.count('#')
+        code_lines = len(first_chars) - comment_lines
+        
+        metrics = {
             'total_lines': len(lines),
-            'code_lines': len([l for l in lines if l.strip() and not l.strip().startswith('#')]),
-            'comment_lines': len([l for l in lines if l.strip().startswith('#')]),
-            'blank_lines': len([l for l in lines if not l.strip()]),
-            'functions': 0,
-            'classes': 0,
+            'code_lines': code_lines,
+            'comment_lines': comment_lines,
+            'blank_lines': blank_lines,
+            'functions': len(functions),
+            'classes': len(classes),
             'max_function_length': 0,
             'avg_function_length': 0,
             'max_class_size': 0,
             'total_complexity': 0
         }
         
-        functions = []
-        classes = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                self.metrics['functions'] += 1
-                length = (node.end_lineno or node.lineno) - node.lineno
-                functions.append(length)
-                
-            elif isinstance(node, ast.ClassDef):
-                self.metrics['classes'] += 1
-                size = (node.end_lineno or node.lineno) - node.lineno
-                classes.append(size)
-        
         if functions:
-            self.metrics['max_function_length'] = max(functions)
-            self.metrics['avg_function_length'] = sum(functions) / len(functions)
+            metrics['max_function_length'] = max(functions)
+            metrics['avg_function_length'] = sum(functions) / len(functions)
         
         if classes:
-            self.metrics['max_class_size'] = max(classes)
-    
-    def _detect_bloater_smells(self, tree: ast.AST, file_path: str):
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Long Method - using relaxed threshold
-                length = (node.end_lineno or node.lineno) - node.lineno
-                if length > self.LONG_METHOD_THRESHOLD:
-                    self.smells.append(CodeSmell(
-                        name="Long Method",
-                        severity="HIGH" if length > 150 else "MEDIUM",
-                        category="Bloater",
-                        description=f"Function '{node.name}' is {length} lines long",
-                        location=file_path,
-                        line=node.lineno,
-                        impact=f"Difficult to understand and maintain. Higher bug probability.",
-                        refactoring_suggestion=f"Extract smaller methods. Aim for < {self.LONG_METHOD_THRESHOLD} lines per function.",
-                        code_example=f
-                    ))
-                
-                # Long Parameter List - using relaxed threshold
-                param_count = len(node.args.args)
-                if param_count > self.LONG_PARAMETER_LIST:
-                    self.smells.append(CodeSmell(
-                        name="Long Parameter List",
-                        severity="MEDIUM",
-                        category="Bloater",
-                        description=f"Function '{node.name}' has {param_count} parameters",
-                        location=file_path,
-                        line=node.lineno,
-                        impact="Hard to call, understand, and maintain.",
-                        refactoring_suggestion="Use parameter objects or configuration classes.",
-                        code_example=f
-                    ))
+            metrics['max_class_size'] = max(classes)
+        
+        return metrics
+    
+    def _run_all_detectors(self, tree: ast.AST, raw: List[tuple]) -> Tuple[List[int], List[int]]:
+        visitor = _SmellVisitor(self, raw)
+        visitor.visit(tree)
+        return visitor.function_lengths, visitor.class_sizes
+    
+    def _check_function(self, node: ast.FunctionDef, length: int, raw: List[tuple]):
+        self._check_bloater_func(node, length, raw)
+        
+        # One attribute scan feeds both coupling checks
+        self_access, foreign_access, other_access = _scan_function_attrs(node)
+        
+        self._check_inappropriate_intimacy(node, foreign_access, raw)
+        
+        # Envy needs more than 5 accesses to one owner, so most functions
+        # are ruled out by the total alone
+        if foreign_access > 5:
+            self._check_feature_envy(node, self_access, other_access, raw)
+    
+    def _check_bloater_func(self, node: ast.FunctionDef, length: int, raw: List[tuple]):
+        # Thresholds are read once per call; the long-method one is needed
+        # again for the suggestion text
+        long_method = self.LONG_METHOD_THRESHOLD
+        long_parameter_list = self.LONG_PARAMETER_LIST
+        
+        # Bloater: Long Method - using relaxed threshold
+        if length > long_method:
+            severity = "HIGH" if length > 150 else "MEDIUM"
+            raw.append((_RULE_LONG_METHOD, severity, node.lineno, node.name, length, long_method))
+        
+        # Bloater: Long Parameter List - using relaxed threshold
+        param_count = len(node.args.args)
+        if param_count > long_parameter_list:
+            raw.append((_RULE_LONG_PARAMETER_LIST, "MEDIUM", node.lineno, node.name, param_count))
+    
+    def _check_inappropriate_intimacy(self, node: ast.FunctionDef, foreign_access: int, raw: List[tuple]):
+        # OO Abuser: Inappropriate Intimacy
+        if foreign_access > 5:
+            raw.append((_RULE_INAPPROPRIATE_INTIMACY, "MEDIUM", node.lineno, node.name, foreign_access))
+    
+    def _check_feature_envy(self, node: ast.FunctionDef, self_access: int, other_access: Dict[str, int], raw: List[tuple]):
+        # Coupler: Feature Envy
+        # Check for envy - but ignore standard modules
+        std_owner_cache = self._std_owner_cache
+        std_modules = self._std_modules
+        for other_obj, count in other_access.items():
+            # Integer tests first; most owners fail them
+            if count <= 5 or count <= self_access:  # Increased threshold
+                continue
+            
+            if len(other_obj) == 1:
+                continue
+            
+            # Skip if it's a standard module
+            is_std = std_owner_cache.get(other_obj)
+            if is_std is None:
+                is_std = std_owner_cache[other_obj] = other_obj.lower() in std_modules
+            if is_std:
+                continue
+            
+            raw.append((_RULE_FEATURE_ENVY, "MEDIUM", node.lineno, node.name, other_obj))
+    
+    def _check_class(self, node: ast.ClassDef, size: int, raw: List[tuple]):
+        # One pass over the body gathers the method count, the non-trivial
+        # method count and the operation types for all three class checks
+        method_count = 0
+        real_count = 0
+        operation_types = set()
+        
+        FunctionDef = ast.FunctionDef
+        trivial_methods = _TRIVIAL_METHODS
+        classify = _classify_method_name
+        for child in node.body:
+            if type(child) is not FunctionDef:
+                continue
+            method_count += 1
+            name = child.name
+            if name not in trivial_methods:
+                real_count += 1
             
-            elif isinstance(node, ast.ClassDef):
-                # Large Class - using relaxed threshold
-                size = (node.end_lineno or node.lineno) - node.lineno
-                methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-                
-                if size > self.LARGE_CLASS_THRESHOLD or len(methods) > 25:
-                    self.smells.append(CodeSmell(
-                        name="Large Class",
-                        severity="HIGH",
-                        category="Bloater",
-                        description=f"Class '{node.name}' has {size} lines and {len(methods)} methods",
-                        location=file_path,
-                        line=node.lineno,
-                        impact="Violates Single Responsibility Principle. Hard to maintain.",
-                        refactoring_suggestion="Split into smaller, focused classes.",
-                        code_example=f
-                    ))
-    
-    def _detect_oo_abuser_smells(self, tree: ast.AST, file_path: str):
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                self_assignments = []
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Attribute):
-                        if isinstance(child.ctx, ast.Store):
-                            if isinstance(child.value, ast.Name):
-                                if child.value.id == 'self':
-                                    self_assignments.append(child.attr)
-                
-                foreign_access = 0
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Attribute):
-                        if isinstance(child.value, ast.Name):
-                            if child.value.id != 'self':
-                                foreign_access += 1
-                
-                if foreign_access > 5:
-                    self.smells.append(CodeSmell(
-                        name="Inappropriate Intimacy",
-                        severity="MEDIUM",
-                        category="OO Abuser",
-                        description=f"Function '{node.name}' accesses other objects' internals {foreign_access} times",
-                        location=file_path,
-                        line=node.lineno,
-                        impact="Tight coupling. Changes in one class break another.",
-                        refactoring_suggestion="Use proper encapsulation. Add methods instead of accessing fields.",
-<<<<<<< HEAD
-                        code_example="Use getters/setters or proper method calls"
-=======
-                        code_example=
->>>>>>> a7156cca8607b0f6a582bfd698319cea39b9fadc
-                    ))
-    
-    def _detect_change_preventer_smells(self, tree: ast.AST, file_path: str):
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # Count different types of operations
-                operation_types = set()
-                
-                for child in node.body:
-                    if isinstance(child, ast.FunctionDef):
-                        # Categorize by name patterns
-                        name = child.name.lower()
-                        if 'get' in name or 'set' in name:
-                            operation_types.add('accessors')
-                        elif 'save' in name or 'load' in name or 'read' in name or 'write' in name:
-                            operation_types.add('persistence')
-                        elif 'validate' in name or 'check' in name:
-                            operation_types.add('validation')
-                        elif 'calculate' in name or 'compute' in name:
-                            operation_types.add('computation')
-                        elif 'format' in name or 'render' in name or 'display' in name:
-                            operation_types.add('presentation')
-                
-                if len(operation_types) > 3:
-                    self.smells.append(CodeSmell(
-                        name="Divergent Change",
-                        severity="HIGH",
-                        category="Change Preventer",
-                        description=f"Class '{node.name}' handles {len(operation_types)} different responsibilities",
-                        location=file_path,
-                        line=node.lineno,
-                        impact="Changes for different reasons. Hard to maintain.",
-                        refactoring_suggestion="Split into separate classes, each with one responsibility.",
-                        code_example=f
-                    ))
-    
-    def _detect_dispensable_smells(self, tree: ast.AST, file_path: str):
-        for node in ast.walk(tree):
-            # Lazy Class (class that doesn't do enough)
-            if isinstance(node, ast.ClassDef):
-                methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
-                real_methods = [m for m in methods if m.name not in ['__init__', '__str__', '__repr__']]
-                
-                if len(real_methods) < 2:
-                    self.smells.append(CodeSmell(
-                        name="Lazy Class",
-                        severity="LOW",
-                        category="Dispensable",
-                        description=f"Class '{node.name}' only has {len(real_methods)} method(s)",
-                        location=file_path,
-                        line=node.lineno,
-                        impact="Unnecessary abstraction. Adds complexity without value.",
-                        refactoring_suggestion="Remove class and inline functionality, or add more behavior.",
-                        code_example=f
-                    ))
-    
-    def _detect_coupler_smells(self, tree: ast.AST, file_path: str):
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                # Count self vs other access
-                self_access = 0
-                other_access = defaultdict(int)
-                
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Attribute):
-                        if isinstance(child.value, ast.Name):
-                            if child.value.id == 'self':
-                                self_access += 1
-                            else:
-                                other_access[child.value.id] += 1
-                
-                # Check for envy - but ignore standard modules
-                for other_obj, count in other_access.items():
-                    # Skip if it's a standard module
-                    if other_obj.lower() in self.STANDARD_MODULES:
-                        continue
-                    
-                    if len(other_obj) == 1:
-                        continue
-                    
-                    if count > self_access and count > 5:  # Increased threshold
-                        self.smells.append(CodeSmell(
-                            name="Feature Envy",
-                            severity="MEDIUM",
-                            category="Coupler",
-                            description=f"Function '{node.name}' uses '{other_obj}' more than 'self'",
-                            location=file_path,
-                            line=node.lineno,
-                            impact="Method is in the wrong class. Poor cohesion.",
-                            refactoring_suggestion=f"Move this method to the '{other_obj}' class.",
-                            code_example=f
-                        ))
-    
-    def get_smell_report(self) -> Dict[str, Any]:
-        if not self.smells:
-            return {
-                'total_smells': 0,
-                'by_severity': {},
-                'by_category': {},
-                'code_health_score': 100.0,
-                'recommendations': ['No code smells detected! Excellent code quality.']
-            }
-        
-        # Categorize
-        by_severity = Counter(s.severity for s in self.smells)
-        by_category = Counter(s.category for s in self.smells)
-        
-        # Calculate health score
-        score = 100.0
-        for smell in self.smells:
-            if smell.severity == 'CRITICAL':
-                score -= 15
-            elif smell.severity == 'HIGH':
-                score -= 10
-            elif smell.severity == 'MEDIUM':
-                score -= 5
-            elif smell.severity == 'LOW':
-                score -= 2
+            # Categorize by name patterns
+            op = classify(name)
+            if op:
+                operation_types.add(op)
         
+        self._check_bloater_class(node, size, method_count, raw)
+        self._check_divergent_change(node, operation_types, raw)
+        self._check_lazy_class(node, real_count, raw)
+    
+    def _check_bloater_class(self, node: ast.ClassDef, size: int, method_count: int, raw: List[tuple]):
+        # Bloater: Large Class - using relaxed threshold
+        if size > self.LARGE_CLASS_THRESHOLD or method_count > 25:
+            raw.append((_RULE_LARGE_CLASS, "HIGH", node.lineno, node.name, size, method_count))
+    
+    def _check_divergent_change(self, node: ast.ClassDef, operation_types: Set[str], raw: List[tuple]):
+        # Change Preventer: too many different types of operations
+        if len(operation_types) > 3:
+            raw.append((_RULE_DIVERGENT_CHANGE, "HIGH", node.lineno, node.name, frozenset(operation_types)))
+    
+    def _check_lazy_class(self, node: ast.ClassDef, real_count: int, raw: List[tuple]):
+        # Dispensable: Lazy Class (class that doesn't do enough)
+        if real_count < 2:
+            raw.append((_RULE_LAZY_CLASS, "LOW", node.lineno, node.name, real_count))
+    
+    def detect_project(self, file_paths: List[str], include_smells: bool = False) -> Dict[str, Any]:
+        # Raw smells from every file are counted and scored together; CodeSmell
+        # records are only built for the per-smell list, when requested
+        raw_by_file = {}
+        rows = []
+        for file_path in file_paths:
+            raw = self._detect_raw(file_path)
+            raw_by_file[file_path] = raw
+            rows.extend(raw)
+        
+        if not rows:
+            report = self._empty_report()
+            report['files_scanned'] = len(file_paths)
+            return report
+        
+        by_severity, by_category, score, recommendations = self._summarize(rows)
+        report = {
+            'files_scanned': len(file_paths),
+            'total_smells': len(rows),
+            'by_severity': by_severity,
+            'by_category': by_category,
+            'code_health_score': round(score, 1),
+            'smells_per_file': {path: len(raw) for path, raw in raw_by_file.items() if raw},
+        }
+        
+        if include_smells:
+            report['smells'] = [
+                dict(_smell_to_dict(s), file=path)
+                for path, raw in raw_by_file.items()
+                for s in _materialize(path, raw)
+            ]
+        
+        report['recommendations'] = recommendations
+        return report
+    
+    def _empty_report(self) -> Dict[str, Any]:
+        return {
+            'total_smells': 0,
+            'by_severity': {},
+            'by_category': {},
+            'code_health_score': 100.0,
+            'recommendations': ['No code smells detected! Excellent code quality.']
+        }
+    
+    def get_smell_report(self, include_smells: bool = True) -> Dict[str, Any]:
+        raw = self._raw
+        if not raw:
+            return self._empty_report()
+        
+        by_severity, by_category, score, recommendations = self._summarize(raw)
+        report = {
+            'total_smells': len(raw),
+            'by_severity': by_severity,
+            'by_category': by_category,
+            'code_health_score': round(score, 1),
+        }
+        
+        # Per-smell dicts are skipped when callers only need scores and counters
+        if include_smells:
+            report['smells'] = self.get_detail()
+        
+        report['recommendations'] = recommendations
+        report['metrics'] = self.metrics
+        return report
+    
+    def get_summary(self) -> Dict[str, Any]:
+        # Counters, score and recommendations only; no CodeSmell is built
+        return self.get_smell_report(include_smells=False)
+    
+    def get_detail(self) -> List[Dict[str, Any]]:
+        return [_smell_to_dict(s) for s in self.smells]
+    
+    def _summarize(self, raw: List[tuple]) -> Tuple[Dict[str, int], Dict[str, int], float, List[str]]:
+        # Count severities and rule ids in a single pass over the raw tuples;
+        # indexing avoids the list a starred unpack builds for every row
+        by_severity = {}
+        by_rule = {}
+        for row in raw:
+            severity = row[1]
+            rule = row[0]
+            by_severity[severity] = by_severity.get(severity, 0) + 1
+            by_rule[rule] = by_rule.get(rule, 0) + 1
+        
+        # Fold the handful of rule counts into categories
+        by_category = {}
+        for rule, count in by_rule.items():
+            category = _RULE_CATEGORY[rule]
+            by_category[category] = by_category.get(category, 0) + count
+        
+        # Calculate health score as counts x weights, one term per severity
+        penalty = self.SEVERITY_PENALTY
+        score = 100.0 - sum(penalty.get(sev, 0) * count for sev, count in by_severity.items())
         score = max(0, score)
         
         # Generate recommendations
         recommendations = []
         
-        if by_severity['HIGH'] > 0 or by_severity.get('CRITICAL', 0) > 0:
+        if by_severity.get('HIGH', 0) > 0 or by_severity.get('CRITICAL', 0) > 0:
             recommendations.append(
                 "PRIORITY: Address high/critical severity smells first."
             )
         
-        if by_category['Bloater'] > 3:
+        if by_category.get('Bloater', 0) > 3:
             recommendations.append(
                 "Bloater smells detected. Refactor large methods and classes."
             )
         
-        if by_category['Coupler'] > 2:
+        if by_category.get('Coupler', 0) > 2:
             recommendations.append(
                 "Coupling issues found. Review class responsibilities and boundaries."
             )
         
-        return {
-            'total_smells': len(self.smells),
-            'by_severity': dict(by_severity),
-            'by_category': dict(by_category),
-            'code_health_score': round(score, 1),
-            'smells': [
-                {
-                    'name': s.name,
-                    'severity': s.severity,
-                    'category': s.category,
-                    'description': s.description,
-                    'line': s.line,
-                    'impact': s.impact,
-                    'refactoring': s.refactoring_suggestion
-                }
-                for s in self.smells
-            ],
-            'recommendations': recommendations,
-            'metrics': self.metrics
-        }
+        return by_severity, by_category, score, recommendations
+
+class _SmellVisitor(ast.NodeVisitor):
+    # visit_* methods are resolved into a node-type table once, when the class
+    # is defined, and visit() drives them from the iterative walker, so each
+    # node costs one dict lookup and there is no recursive generic_visit
+    
+    def __init__(self, detector: IntelligentSmellDetector, raw: List[tuple]):
+        self.detector = detector
+        self.raw = raw
+        self.function_lengths = []
+        self.class_sizes = []
+    
+    def visit(self, tree: ast.AST):
+        dispatch = self._dispatch
+        for node in _walk_interesting(tree, self._node_types):
+            dispatch[type(node)](self, node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        length = (node.end_lineno or node.lineno) - node.lineno
+        self.function_lengths.append(length)
+        self.detector._check_function(node, length, self.raw)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        size = (node.end_lineno or node.lineno) - node.lineno
+        self.class_sizes.append(size)
+        self.detector._check_class(node, size, self.raw)
+
+_SmellVisitor._dispatch = {
+    getattr(ast, name[len('visit_'):]): method
+    for name, method in vars(_SmellVisitor).items()
+    if name.startswith('visit_')
+}
+_SmellVisitor._node_types = frozenset(_SmellVisitor._dispatch)
+
+def _scan_one(file_path: str) -> List[tuple]:
+    # Worker entry point; a fresh detector per file keeps processes
+    # independent, and raw tuples are cheap to send back
+    return IntelligentSmellDetector()._detect_raw(file_path)
+
+def detect_smells_batch(file_paths: List[str], workers: Optional[int] = None) -> Dict[str, List[CodeSmell]]:
+    results = run_batch(_scan_one, file_paths, workers)
+    return {path: _materialize(path, raw) for path, raw in results.items()}
 
 # Example usage
 if __name__ == '__main__':
@@ -1,13 +1,95 @@
 import re
 import os
+import sys
 import logging
+from collections import Counter
+from functools import cached_property, lru_cache
+from operator import attrgetter
+from pathlib import Path
 from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import hashlib
 
+try:
+    from ..utils.common import DATACLASS_SLOTS, EXCLUDED_DIRS, EXCLUDED_DIR_SUFFIXES, run_batch
+    from ..utils.result_cache import ResultCache, config_key
+except ImportError:
+    # Run as a script or imported as a top-level module (scanner, core.*):
+    # put src on the path so the shared utils package resolves
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.common import DATACLASS_SLOTS, EXCLUDED_DIRS, EXCLUDED_DIR_SUFFIXES, run_batch
+    from utils.result_cache import ResultCache, config_key
+
 logger = logging.getLogger(__name__)
 
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Escapes keep their case ("\\S" is not "\\s"); other uppercase letters are
+# lowered
+_PATTERN_LETTER_RE = re.compile(r'\\.|[A-Z]')
+
+def _combine_patterns(patterns):
+    # One case-sensitive alternation of every pattern in a category, with
+    # the letters lowered and any "(?i)" dropped, for searching _fold_case
+    # text. Folding the text and the patterns alike turns each
+    # case-insensitive match into a plain one and only adds matches for
+    # case-sensitive patterns, which the exact patterns then reject; the
+    # engine no longer folds case at every position
+    parts = []
+    for pattern in patterns:
+        if pattern.startswith('(?i)'):
+            pattern = pattern[4:]
+        pattern = _PATTERN_LETTER_RE.sub(lambda m: m.group(0).lower(), pattern)
+        parts.append('(?:' + pattern + ')')
+    return re.compile('|'.join(parts))
+
+# Non-ASCII characters that re's IGNORECASE matches against an ASCII letter
+# but str.lower() does not lower to it ('K' already lowers to 'k')
+_CASE_FOLD_EXTRAS = (('\u0131', 'i'), ('\u017f', 's'))
+
+def _fold_case(text: str) -> str:
+    # Lowercased text in which every trigger a pattern could match shows up,
+    # one character per character of text so newlines stay where they are
+    if text.isascii():
+        return text.lower()
+    
+    # 'İ' would lower to two characters
+    lowered = text.replace('\u0130', 'i').lower()
+    for char, letter in _CASE_FOLD_EXTRAS:
+        if char in lowered:
+            lowered = lowered.replace(char, letter)
+    return lowered
+
+def _hyperscan_filter(patterns, caseless: bool = False):
+    # The same category filter as one hyperscan database, or None when a
+    # pattern does not compile. Prefilter mode matches a superset where
+    # hyperscan has no exact equivalent (e.g. the password lookahead),
+    # which is enough: every candidate line is confirmed with re
+    expressions = []
+    flags = []
+    for pattern in patterns:
+        pattern_flags = hyperscan.HS_FLAG_PREFILTER
+        if pattern.startswith('(?i)'):
+            pattern = pattern[4:]
+            pattern_flags |= hyperscan.HS_FLAG_CASELESS
+        elif caseless:
+            pattern_flags |= hyperscan.HS_FLAG_CASELESS
+        expressions.append(pattern.encode())
+        flags.append(pattern_flags)
+    
+    db = hyperscan.Database()
+    try:
+        db.compile(expressions=expressions, ids=list(range(len(expressions))), elements=len(expressions), flags=flags)
+    except hyperscan.error as e:
+        logger.warning(f"Hyperscan could not compile patterns, using re: {e}")
+        return None
+    return db
+
 class SecurityLevel(Enum):
     pass
     CRITICAL = "critical"
@@ -26,7 +108,9 @@ class VulnerabilityType(Enum):
     WEAK_CRYPTO = "weak_cryptography"
     HARDCODED_CREDENTIALS = "hardcoded_credentials"
 
-@dataclass
+# Large scans hold tens of thousands of issues; slots drop the per-instance
+# __dict__
+@dataclass(**DATACLASS_SLOTS)
 class SecurityIssue:
     pass
     file_path: str
@@ -40,10 +124,45 @@ class SecurityIssue:
     cwe_id: Optional[str] = None  # Common Weakness Enumeration ID
     
     def to_dict(self) -> Dict:
-        data = asdict(self)
-        data['severity'] = self.severity.value
-        data['vulnerability_type'] = self.vulnerability_type.value
-        return data
+        # Every field is a flat value, so a literal avoids asdict()'s
+        # recursive deepcopy for each issue in a report
+        return {
+            'file_path': self.file_path,
+            'line_number': self.line_number,
+            'severity': self.severity.value,
+            'vulnerability_type': self.vulnerability_type.value,
+            'title': self.title,
+            'description': self.description,
+            'remediation': self.remediation,
+            'code_snippet': self.code_snippet,
+            'cwe_id': self.cwe_id,
+        }
+
+@lru_cache(maxsize=128)
+def _stars(count: int) -> str:
+    return '*' * count
+
+def _mask_secret(secret: str) -> str:
+    # Keep the first and last four characters of longer secrets; short ones
+    # are masked entirely
+    length = len(secret)
+    if length > 8:
+        return f"{secret[:4]}{_stars(length - 8)}{secret[-4:]}"
+    return _stars(length)
+
+def _issue_row(issue: SecurityIssue) -> tuple:
+    # Every field but the path, in field order, so a cached finding can be
+    # rebuilt for whichever file has the same content. Enums are stored by
+    # value: a pickled member names its module, and this one is loaded as
+    # both src.modules.security and modules.security
+    return (
+        issue.line_number, issue.severity.value, issue.vulnerability_type.value, issue.title,
+        issue.description, issue.remediation, issue.code_snippet, issue.cwe_id,
+    )
+
+def _issue_from_row(file_path: str, row: tuple) -> SecurityIssue:
+    line_number, severity, vulnerability_type, *rest = row
+    return SecurityIssue(file_path, line_number, SecurityLevel(severity), VulnerabilityType(vulnerability_type), *rest)
 
 class SecurityScanner:
     pass
@@ -131,165 +250,357 @@ class SecurityScanner:
         (r'\.\./|\.\.\\\\', 'Directory traversal pattern in string'),
     ]
     
-    def __init__(self):
-        logger.info("Initialized Security Scanner")
+    # Lowercase substrings, one of which every match of a category's patterns
+    # contains; lines without any of them are never searched for that category
+    SECRET_TRIGGERS = ('akia', 'aws_secret_access_key', 'ghp_', 'aiza', 'xox', 'api', '-----begin', 'pass', 'pwd', 'eyj')
+    SQL_INJECTION_TRIGGERS = ('execute', 'select')
+    COMMAND_INJECTION_TRIGGERS = ('system', 'subprocess', 'eval(', 'exec(')
+    WEAK_CRYPTO_TRIGGERS = ('md5', 'sha1', 'random', 'des', 'rc4', 'rc2')
+    PATH_TRAVERSAL_TRIGGERS = ('open(', 'join(', '..')
     
-    def scan_for_secrets(self, content: str, file_path: str) -> List[SecurityIssue]:
-        issues = []
-        lines = content.split('\n')
+    # Security score penalty per issue of each severity, in report order
+    SEVERITY_WEIGHTS = {'critical': 10, 'high': 5, 'medium': 2, 'low': 1}
+    
+    # Issue rows (every field but the path) per file content, shared by all
+    # scanners
+    RESULT_CACHE_SIZE = 1024
+    _result_cache = ResultCache(RESULT_CACHE_SIZE)
+    
+    # Part of the cache key; raise it whenever the issue rows or the scan
+    # logic change
+    RESULT_CACHE_VERSION = 2
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        # Where findings are also stored on disk, e.g. ~/.cache/codepulse/security
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         
-        for secret_type, (pattern, description, cwe) in self.SECRET_PATTERNS.items():
-            for line_num, line in enumerate(lines, 1):
-                # Skip comments
-                if line.strip().startswith('#'):
-                    continue
-                
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    # Create a masked version of the secret
-                    secret = match.group(0) if match.lastindex is None else match.group(1)
-                    masked_secret = secret[:4] + '*' * (len(secret) - 8) + secret[-4:] if len(secret) > 8 else '*' * len(secret)
-                    
-                    issue = SecurityIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=SecurityLevel.CRITICAL,
-                        vulnerability_type=VulnerabilityType.SECRET_EXPOSURE,
-                        title=f"{description} detected",
-                        description=f"Hardcoded secret found: {masked_secret}. Secrets should never be stored in code.",
-                        remediation="Move secrets to environment variables or a secure secret management system (e.g., AWS Secrets Manager, Azure Key Vault, HashiCorp Vault).",
-                        code_snippet=line.strip(),
-                        cwe_id=cwe
-                    )
-                    issues.append(issue)
+        # Findings depend on every pattern and trigger, so they are all part
+        # of the cache key; subclasses that change them get their own entries
+        config = (
+            self.RESULT_CACHE_VERSION, self.SECRET_PATTERNS, self.SQL_INJECTION_PATTERNS,
+            self.COMMAND_INJECTION_PATTERNS, self.WEAK_CRYPTO_PATTERNS, self.PATH_TRAVERSAL_PATTERNS,
+            self.SECRET_TRIGGERS, self.SQL_INJECTION_TRIGGERS, self.COMMAND_INJECTION_TRIGGERS,
+            self.WEAK_CRYPTO_TRIGGERS, self.PATH_TRAVERSAL_TRIGGERS,
+        )
+        self._config_key = config_key(*config)
+        
+        # Every category's triggers as bytes, for ruling out whole files
+        # before they are decoded
+        self._file_triggers = tuple({
+            trigger.encode()
+            for triggers in (
+                self.SECRET_TRIGGERS, self.SQL_INJECTION_TRIGGERS, self.COMMAND_INJECTION_TRIGGERS,
+                self.WEAK_CRYPTO_TRIGGERS, self.PATH_TRAVERSAL_TRIGGERS,
+            )
+            for trigger in triggers
+        })
         
-        return issues
+        logger.info("Initialized Security Scanner")
     
-    def scan_for_sql_injection(self, content: str, file_path: str) -> List[SecurityIssue]:
-        issues = []
-        lines = content.split('\n')
+    # Filters and patterns are built on first use, so a scanner only compiles
+    # the categories it actually runs
+    
+    def _category_filter(self, patterns: List[str], caseless: bool = False):
+        # The category's patterns combined into one line filter: a line it
+        # does not match cannot match any single pattern, so the per-pattern
+        # loops only visit the lines it selects. With hyperscan installed it
+        # scans the whole file in one call instead
+        if HYPERSCAN_AVAILABLE:
+            db = _hyperscan_filter(patterns, caseless)
+            if db is not None:
+                return db
+        return _combine_patterns(patterns)
+    
+    @cached_property
+    def _secret_filter(self):
+        return self._category_filter([pattern for pattern, _, _ in self.SECRET_PATTERNS.values()])
+    
+    @cached_property
+    def _sql_filter(self):
+        return self._category_filter([pattern for pattern, _ in self.SQL_INJECTION_PATTERNS], caseless=True)
+    
+    @cached_property
+    def _command_filter(self):
+        return self._category_filter([pattern for pattern, _ in self.COMMAND_INJECTION_PATTERNS])
+    
+    @cached_property
+    def _crypto_filter(self):
+        return self._category_filter([pattern for pattern, _ in self.WEAK_CRYPTO_PATTERNS], caseless=True)
+    
+    @cached_property
+    def _path_filter(self):
+        return self._category_filter([pattern for pattern, _ in self.PATH_TRAVERSAL_PATTERNS])
+    
+    # Patterns compiled once per scanner instead of looked up in re's cache
+    # for every line; case-insensitive categories bake the flag in
+    
+    @cached_property
+    def _compiled_secrets(self):
+        return [
+            (re.compile(pattern), description, cwe)
+            for pattern, description, cwe in self.SECRET_PATTERNS.values()
+        ]
+    
+    @cached_property
+    def _compiled_sql(self):
+        return [
+            (re.compile(pattern, re.IGNORECASE), description)
+            for pattern, description in self.SQL_INJECTION_PATTERNS
+        ]
+    
+    @cached_property
+    def _compiled_command(self):
+        return [
+            (re.compile(pattern), description,
+             SecurityLevel.CRITICAL if 'eval' in pattern or 'exec' in pattern else SecurityLevel.HIGH)
+            for pattern, description in self.COMMAND_INJECTION_PATTERNS
+        ]
+    
+    @cached_property
+    def _compiled_crypto(self):
+        return [
+            (re.compile(pattern, re.IGNORECASE), description)
+            for pattern, description in self.WEAK_CRYPTO_PATTERNS
+        ]
+    
+    @cached_property
+    def _compiled_path(self):
+        return [
+            (re.compile(pattern), description)
+            for pattern, description in self.PATH_TRAVERSAL_PATTERNS
+        ]
+    
+    def _candidate_lines(self, line_filter, triggers, content: str, lines: List[str],
+                         lowered: Optional[str] = None) -> List[tuple]:
+        # (line number, line) for every line the category filter matches
+        if lowered is None:
+            lowered = _fold_case(content)
+        
+        if isinstance(line_filter, re.Pattern):
+            # Every match holds one of the triggers, so str.find over each
+            # trigger picks the lines worth searching, and the filter only
+            # runs on those, bounded to the line. The folded line matches
+            # wherever the original does, so no hit is lost
+            find = lowered.find
+            rfind = lowered.rfind
+            line_starts = set()
+            for trigger in triggers:
+                index = find(trigger)
+                while index != -1:
+                    line_starts.add(rfind('\n', 0, index) + 1)
+                    line_end = find('\n', index)
+                    if line_end == -1:
+                        break
+                    index = find(trigger, line_end + 1)
+            
+            search = line_filter.search
+            count = lowered.count
+            text_end = len(lowered)
+            candidates = []
+            line_num = 1
+            counted = 0
+            for line_start in sorted(line_starts):
+                line_end = find('\n', line_start)
+                if line_end == -1:
+                    line_end = text_end
+                if search(lowered, line_start, line_end):
+                    line_num += count('\n', counted, line_start)
+                    counted = line_start
+                    candidates.append((line_num, lines[line_num - 1]))
+            return candidates
+        
+        if not any(trigger in lowered for trigger in triggers):
+            return []
         
-        for pattern, description in self.SQL_INJECTION_PATTERNS:
-            for line_num, line in enumerate(lines, 1):
-                if re.search(pattern, line, re.IGNORECASE):
-                    issue = SecurityIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=SecurityLevel.HIGH,
-                        vulnerability_type=VulnerabilityType.SQL_INJECTION,
-                        title="Potential SQL Injection vulnerability",
-                        description=f"{description}. This could allow attackers to execute arbitrary SQL commands.",
-                        remediation="Use parameterized queries or an ORM. Replace string concatenation/formatting with query parameters.",
-                        code_snippet=line.strip(),
-                        cwe_id="CWE-89"
-                    )
-                    issues.append(issue)
+        # Hyperscan reports where matches end; a match within a line ends on
+        # that line, so the lines holding an end offset cover every hit.
+        # Matches spanning lines only add candidates that re then rejects
+        data = content.encode('utf-8', 'ignore')
+        ends = set()
         
-        return issues
+        def on_match(pattern_id, start, end, flags, context):
+            ends.add(end - 1)
+        
+        line_filter.scan(data, match_event_handler=on_match)
+        
+        # Line numbers come from counting newlines between consecutive match
+        # ends, like the re path, so no newline index is built
+        count = data.count
+        candidates = []
+        line_num = 1
+        counted = 0
+        for end in sorted(ends):
+            line_num += count(b'\n', counted, end)
+            counted = end
+            if not candidates or candidates[-1][0] != line_num:
+                candidates.append((line_num, lines[line_num - 1]))
+        return candidates
     
-    def scan_for_command_injection(self, content: str, file_path: str) -> List[SecurityIssue]:
-        issues = []
-        lines = content.split('\n')
+    def scan_for_secrets(self, content: str, file_path: str, lines: Optional[List[str]] = None,
+                         lowered: Optional[str] = None) -> List[SecurityIssue]:
+        if lines is None:
+            lines = content.split('\n')
         
-        for pattern, description in self.COMMAND_INJECTION_PATTERNS:
-            for line_num, line in enumerate(lines, 1):
-                if re.search(pattern, line):
-                    severity = SecurityLevel.CRITICAL if 'eval' in pattern or 'exec' in pattern else SecurityLevel.HIGH
-                    
-                    issue = SecurityIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=severity,
-                        vulnerability_type=VulnerabilityType.COMMAND_INJECTION,
-                        title="Command injection vulnerability",
-                        description=f"{description}. Attackers could execute arbitrary system commands.",
-                        remediation="Avoid using shell=True, validate and sanitize all inputs, use subprocess with list arguments instead of strings.",
-                        code_snippet=line.strip(),
-                        cwe_id="CWE-78"
-                    )
-                    issues.append(issue)
+        # Skip comments; only lines the filter matched are checked, and only
+        # their leading whitespace is stripped
+        candidates = [
+            (line_num, line) for line_num, line in self._candidate_lines(self._secret_filter, self.SECRET_TRIGGERS, content, lines, lowered)
+            if line.lstrip()[:1] != '#'
+        ]
         
-        return issues
+        # Built in one comprehension with positional fields: no append or
+        # keyword binding per issue. Order stays pattern, line, match
+        return [
+            SecurityIssue(
+                file_path, line_num, SecurityLevel.CRITICAL, VulnerabilityType.SECRET_EXPOSURE,
+                f"{description} detected",
+                f"Hardcoded secret found: {_mask_secret(match.group(0) if match.lastindex is None else match.group(1))}. "
+                "Secrets should never be stored in code.",
+                "Move secrets to environment variables or a secure secret management system (e.g., AWS Secrets Manager, Azure Key Vault, HashiCorp Vault).",
+                line.strip(), cwe,
+            )
+            for pattern, description, cwe in self._compiled_secrets
+            for line_num, line in candidates
+            for match in pattern.finditer(line)
+        ]
     
-    def scan_for_weak_crypto(self, content: str, file_path: str) -> List[SecurityIssue]:
-        issues = []
-        lines = content.split('\n')
+    def scan_for_sql_injection(self, content: str, file_path: str, lines: Optional[List[str]] = None,
+                               lowered: Optional[str] = None) -> List[SecurityIssue]:
+        if lines is None:
+            lines = content.split('\n')
+        candidates = self._candidate_lines(self._sql_filter, self.SQL_INJECTION_TRIGGERS, content, lines, lowered)
         
-        for pattern, description in self.WEAK_CRYPTO_PATTERNS:
-            for line_num, line in enumerate(lines, 1):
-                if re.search(pattern, line, re.IGNORECASE):
-                    issue = SecurityIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=SecurityLevel.MEDIUM,
-                        vulnerability_type=VulnerabilityType.WEAK_CRYPTO,
-                        title="Weak cryptographic algorithm",
-                        description=f"{description}. This algorithm is not suitable for security-sensitive operations.",
-                        remediation="Use SHA-256 or SHA-3 for hashing, secrets module for random values, and AES-256 for encryption.",
-                        code_snippet=line.strip(),
-                        cwe_id="CWE-327"
-                    )
-                    issues.append(issue)
+        return [
+            SecurityIssue(
+                file_path, line_num, SecurityLevel.HIGH, VulnerabilityType.SQL_INJECTION,
+                "Potential SQL Injection vulnerability",
+                f"{description}. This could allow attackers to execute arbitrary SQL commands.",
+                "Use parameterized queries or an ORM. Replace string concatenation/formatting with query parameters.",
+                line.strip(), "CWE-89",
+            )
+            for pattern, description in self._compiled_sql
+            for line_num, line in candidates
+            if pattern.search(line)
+        ]
+    
+    def scan_for_command_injection(self, content: str, file_path: str, lines: Optional[List[str]] = None,
+                                   lowered: Optional[str] = None) -> List[SecurityIssue]:
+        if lines is None:
+            lines = content.split('\n')
+        candidates = self._candidate_lines(self._command_filter, self.COMMAND_INJECTION_TRIGGERS, content, lines, lowered)
         
-        return issues
+        return [
+            SecurityIssue(
+                file_path, line_num, severity, VulnerabilityType.COMMAND_INJECTION,
+                "Command injection vulnerability",
+                f"{description}. Attackers could execute arbitrary system commands.",
+                "Avoid using shell=True, validate and sanitize all inputs, use subprocess with list arguments instead of strings.",
+                line.strip(), "CWE-78",
+            )
+            for pattern, description, severity in self._compiled_command
+            for line_num, line in candidates
+            if pattern.search(line)
+        ]
     
-    def scan_for_path_traversal(self, content: str, file_path: str) -> List[SecurityIssue]:
-        issues = []
-        lines = content.split('\n')
+    def scan_for_weak_crypto(self, content: str, file_path: str, lines: Optional[List[str]] = None,
+                             lowered: Optional[str] = None) -> List[SecurityIssue]:
+        if lines is None:
+            lines = content.split('\n')
+        candidates = self._candidate_lines(self._crypto_filter, self.WEAK_CRYPTO_TRIGGERS, content, lines, lowered)
         
-        for pattern, description in self.PATH_TRAVERSAL_PATTERNS:
-            for line_num, line in enumerate(lines, 1):
-                if re.search(pattern, line):
-                    issue = SecurityIssue(
-                        file_path=file_path,
-                        line_number=line_num,
-                        severity=SecurityLevel.HIGH,
-                        vulnerability_type=VulnerabilityType.PATH_TRAVERSAL,
-                        title="Path traversal vulnerability",
-                        description=f"{description}. Attackers could access files outside intended directory.",
-                        remediation="Validate file paths, use os.path.abspath() and check if result is within allowed directory.",
-                        code_snippet=line.strip(),
-                        cwe_id="CWE-22"
-                    )
-                    issues.append(issue)
+        return [
+            SecurityIssue(
+                file_path, line_num, SecurityLevel.MEDIUM, VulnerabilityType.WEAK_CRYPTO,
+                "Weak cryptographic algorithm",
+                f"{description}. This algorithm is not suitable for security-sensitive operations.",
+                "Use SHA-256 or SHA-3 for hashing, secrets module for random values, and AES-256 for encryption.",
+                line.strip(), "CWE-327",
+            )
+            for pattern, description in self._compiled_crypto
+            for line_num, line in candidates
+            if pattern.search(line)
+        ]
+    
+    def scan_for_path_traversal(self, content: str, file_path: str, lines: Optional[List[str]] = None,
+                                lowered: Optional[str] = None) -> List[SecurityIssue]:
+        if lines is None:
+            lines = content.split('\n')
+        candidates = self._candidate_lines(self._path_filter, self.PATH_TRAVERSAL_TRIGGERS, content, lines, lowered)
         
-        return issues
+        return [
+            SecurityIssue(
+                file_path, line_num, SecurityLevel.HIGH, VulnerabilityType.PATH_TRAVERSAL,
+                "Path traversal vulnerability",
+                f"{description}. Attackers could access files outside intended directory.",
+                "Validate file paths, use os.path.abspath() and check if result is within allowed directory.",
+                line.strip(), "CWE-22",
+            )
+            for pattern, description in self._compiled_path
+            for line_num, line in candidates
+            if pattern.search(line)
+        ]
     
     def scan_file(self, file_path: str) -> List[SecurityIssue]:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                data = f.read()
         except Exception as e:
             logger.error(f"Could not read {file_path}: {e}")
             return []
         
+        # Most files trip no category at all. For ASCII files that is decided
+        # on the raw bytes, without decoding; other files are decoded first
+        # since case-insensitive matches can involve non-ASCII letters
+        if data.isascii():
+            lowered = data.lower()
+            if not any(trigger in lowered for trigger in self._file_triggers):
+                return []
+        
+        # Content seen before, under any path, reuses the earlier findings
+        content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        rows = self._result_cache.get(content_hash, self._config_key, self.cache_dir)
+        if rows is not None:
+            return [_issue_from_row(file_path, row) for row in rows]
+        
+        all_issues = self._scan_content(data, file_path)
+        
+        rows = [_issue_row(issue) for issue in all_issues]
+        self._result_cache.put(content_hash, self._config_key, rows, self.cache_dir)
+        
+        return all_issues
+    
+    def _scan_content(self, data: bytes, file_path: str) -> List[SecurityIssue]:
+        # Same text as reading in text mode: undecodable bytes dropped and
+        # newlines translated
+        content = data.decode('utf-8', 'ignore')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        
         all_issues = []
         
+        # Split and case-fold once and share both between all scans
+        lines = content.split('\n')
+        lowered = _fold_case(content)
+        
         # Run all security scans
-        all_issues.extend(self.scan_for_secrets(content, file_path))
-        all_issues.extend(self.scan_for_sql_injection(content, file_path))
-        all_issues.extend(self.scan_for_command_injection(content, file_path))
-        all_issues.extend(self.scan_for_weak_crypto(content, file_path))
-        all_issues.extend(self.scan_for_path_traversal(content, file_path))
+        all_issues.extend(self.scan_for_secrets(content, file_path, lines, lowered))
+        all_issues.extend(self.scan_for_sql_injection(content, file_path, lines, lowered))
+        all_issues.extend(self.scan_for_command_injection(content, file_path, lines, lowered))
+        all_issues.extend(self.scan_for_weak_crypto(content, file_path, lines, lowered))
+        all_issues.extend(self.scan_for_path_traversal(content, file_path, lines, lowered))
         
         return all_issues
     
     def generate_report(self, issues: List[SecurityIssue]) -> Dict:
-        # Count by severity
+        # Count the enum members themselves in C and read .value once per
+        # distinct member rather than once per issue; severities are laid
+        # out in a fixed order with zeros for the ones not seen
+        by_severity = Counter(map(attrgetter('severity'), issues))
         severity_counts = {
-            'critical': 0,
-            'high': 0,
-            'medium': 0,
-            'low': 0
+            severity: by_severity[SecurityLevel(severity)] for severity in self.SEVERITY_WEIGHTS
         }
-        
-        # Count by type
-        type_counts = {}
-        
-        for issue in issues:
-            severity_counts[issue.severity.value] += 1
-            vuln_type = issue.vulnerability_type.value
-            type_counts[vuln_type] = type_counts.get(vuln_type, 0) + 1
+        by_type = Counter(map(attrgetter('vulnerability_type'), issues))
+        type_counts = {vuln_type.value: count for vuln_type, count in by_type.items()}
         
         # Calculate security score (0-100)
         total_issues = len(issues)
@@ -297,12 +608,7 @@ class SecurityScanner:
             security_score = 100
         else:
             # Weight issues by severity
-            weighted_score = (
-                severity_counts['critical'] * 10 +
-                severity_counts['high'] * 5 +
-                severity_counts['medium'] * 2 +
-                severity_counts['low'] * 1
-            )
+            weighted_score = sum(self.SEVERITY_WEIGHTS[severity] * count for severity, count in severity_counts.items())
             security_score = max(0, 100 - weighted_score)
         
         return {
@@ -313,9 +619,49 @@ class SecurityScanner:
             'issues': [issue.to_dict() for issue in issues]
         }
 
+# One scanner per worker process, built on first use so the patterns are
+# compiled once per worker rather than once per file
+_worker_scanner = None
+
+def _scan_one(file_path: str) -> List[SecurityIssue]:
+    global _worker_scanner
+    if _worker_scanner is None:
+        _worker_scanner = SecurityScanner()
+    return _worker_scanner.scan_file(file_path)
+
+def scan_files(file_paths: List[str], workers: Optional[int] = None) -> Dict[str, List[SecurityIssue]]:
+    return run_batch(_scan_one, file_paths, workers)
+
+def _find_python_files(root: str) -> List[str]:
+    # Same order as os.walk (each directory's files, then its subdirectories
+    # depth first) but from os.scandir entries, whose type comes with the
+    # listing, and without descending into excluded or symlinked directories
+    file_paths = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if name not in EXCLUDED_DIRS and not name.endswith(EXCLUDED_DIR_SUFFIXES) and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif name.endswith('.py'):
+                file_paths.append(entry.path)
+        stack.extend(reversed(subdirs))
+    return file_paths
+
 def main():
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python security.py <file_or_directory>")
         sys.exit(1)
@@ -328,11 +674,9 @@ def main():
     if os.path.isfile(target):
         all_issues = scanner.scan_file(target)
     elif os.path.isdir(target):
-        for root, dirs, files in os.walk(target):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    all_issues.extend(scanner.scan_file(file_path))
+        # Files are independent, so they are scanned across processes
+        for issues in scan_files(_find_python_files(target)).values():
+            all_issues.extend(issues)
     
     # Generate report
     report = scanner.generate_report(all_issues)
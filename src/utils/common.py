@@ -0,0 +1,37 @@
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Keyword arguments that give a dataclass __slots__; slots=True is only
+# accepted from Python 3.10 on. Usage: @dataclass(**DATACLASS_SLOTS)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# concurrent.futures is imported inside run_batch, so modules that only need
+# EXCLUDED_DIRS do not pull in multiprocessing with it
+
+# Directories never worth scanning: VCS metadata, caches, virtualenvs,
+# editor settings and build output
+EXCLUDED_DIRS = frozenset({
+    '__pycache__', '.git', '.svn', '.hg', 'node_modules',
+    '.venv', 'venv', 'env', '.idea', '.vscode', 'dist', 'build',
+})
+
+# Directories skipped by name suffix, e.g. pkg.egg-info
+EXCLUDED_DIR_SUFFIXES = ('.egg-info',)
+
+
+def run_batch(fn: Callable[[str], Any], paths: Iterable[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    # fn(path) for every path, across processes; fn must be a module-level
+    # function so it can be sent to the workers
+    paths = list(paths)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    
+    # A pool costs more to start than a handful of files take to process
+    if workers <= 1:
+        return dict(zip(paths, map(fn, paths)))
+    
+    # Hand out paths in chunks so each worker round trip covers several
+    chunksize = max(1, len(paths) // (workers * 4))
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(paths, executor.map(fn, paths, chunksize=chunksize)))
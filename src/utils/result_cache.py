@@ -0,0 +1,85 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+
+def config_key(*config: Hashable) -> str:
+    # Short digest of everything a result depends on besides the content;
+    # entries stored under another configuration are never looked up
+    return hashlib.blake2b(repr(config).encode(), digest_size=8).hexdigest()
+
+
+class ResultCache:
+    
+    # (content hash, config key) -> result, least recently used first; keyed
+    # by content, so copies of a file share one entry. The optional on-disk
+    # store is shared across processes and runs
+    
+    def __init__(self, size: int):
+        self.size = size
+        self._entries: 'OrderedDict[tuple, Any]' = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def get(self, content_hash: str, config: str, cache_dir: Optional[Path] = None) -> Optional[Any]:
+        key = (content_hash, config)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            return result
+        
+        if cache_dir is None:
+            return None
+        result = _load(_entry_path(cache_dir, content_hash, config))
+        if result is not None:
+            self._remember(key, result)
+        return result
+    
+    def put(self, content_hash: str, config: str, result: Any, cache_dir: Optional[Path] = None):
+        self._remember((content_hash, config), result)
+        if cache_dir is not None:
+            _store(_entry_path(cache_dir, content_hash, config), result)
+    
+    def _remember(self, key: tuple, result: Any):
+        entries = self._entries
+        entries[key] = result
+        if len(entries) > self.size:
+            entries.popitem(last=False)
+
+
+def _entry_path(cache_dir: Path, content_hash: str, config: str) -> Path:
+    return cache_dir / f"{content_hash}-{config}.pickle"
+
+
+def _load(path: Path) -> Optional[Any]:
+    # Anything unreadable is a miss: besides I/O and truncated files, an entry
+    # can name a module or class this process cannot import
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _store(path: Path, result: Any):
+    # Written to a per-process temp file and renamed into place, so
+    # concurrent workers never read a half-written entry; a failed write
+    # leaves nothing behind
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError):
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
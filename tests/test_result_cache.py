@@ -0,0 +1,44 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.result_cache import ResultCache, config_key
+
+
+class TestResultCache:
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(2)
+        cache.put('a', 'k', 1)
+        cache.put('b', 'k', 2)
+        assert cache.get('a', 'k') == 1
+        cache.put('c', 'k', 3)
+        
+        assert len(cache) == 2
+        assert cache.get('b', 'k') is None
+        assert cache.get('a', 'k') == 1
+        assert cache.get('a', 'other') is None
+    
+    def test_entries_persist_in_cache_dir(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_dir = Path(cache_dir)
+            ResultCache(4).put('abc', config_key(1, 'x'), [(1, 'row')], cache_dir)
+            
+            assert ResultCache(4).get('abc', config_key(1, 'x'), cache_dir) == [(1, 'row')]
+            assert ResultCache(4).get('abc', config_key(2, 'x'), cache_dir) is None
+    
+    def test_failed_write_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_dir = Path(cache_dir)
+            with patch('src.utils.result_cache.os.replace', side_effect=OSError):
+                ResultCache(4).put('abc', 'k', [1], cache_dir)
+            
+            assert list(cache_dir.iterdir()) == []
+            assert ResultCache(4).get('abc', 'k', cache_dir) is None
+    
+    def test_unloadable_entry_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_dir = Path(cache_dir)
+            (cache_dir / "abc-k.pickle").write_bytes(b"cno_such_module\nThing\n.")
+            
+            assert ResultCache(4).get('abc', 'k', cache_dir) is None
@@ -0,0 +1,277 @@
+import pytest
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from src.core import smell_detector
+from src.core.smell_detector import CodeSmell, IntelligentSmellDetector, detect_smells_batch
+
+
+SMELLY_CODE = '''
+import os
+
+
+class Report:
+    def get_title(self):
+        return self.title
+
+    def save_report(self):
+        pass
+
+    def validate_report(self):
+        pass
+
+    def calculate_total(self):
+        pass
+
+    def render_html(self):
+        pass
+
+
+class Holder:
+    def __init__(self):
+        self.value = 1
+
+
+def build(a, b, c, d, e, f, g):
+    return a
+
+
+def summarize(self, order):
+    total = order.price + order.tax + order.fee
+    total += order.shipping + order.discount + order.tip
+    return os.path.join(str(total), order.name)
+'''
+
+
+def write_sample(directory, code=SMELLY_CODE):
+    sample = Path(directory) / "sample.py"
+    sample.write_text(code)
+    return str(sample)
+
+
+class TestIntelligentSmellDetector:
+    
+    def test_detects_each_smell_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            smells = detector.detect_smells(write_sample(tmpdir))
+            
+            # Emitted in source order
+            assert [(s.name, s.line) for s in smells] == [
+                ('Divergent Change', 5),
+                ('Lazy Class', 22),
+                ('Long Parameter List', 27),
+                ('Inappropriate Intimacy', 31),
+                ('Feature Envy', 31),
+            ]
+    
+    def test_report_and_metrics(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            detector.detect_smells(write_sample(tmpdir))
+            report = detector.get_smell_report()
+            
+            assert report['total_smells'] == 5
+            assert report['by_severity'] == {'HIGH': 1, 'MEDIUM': 3, 'LOW': 1}
+            assert report['code_health_score'] == 73.0
+            assert report['metrics']['functions'] == 8
+            assert report['metrics']['classes'] == 2
+            assert report['metrics']['blank_lines'] > 0
+    
+    def test_report_without_smell_list(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            detector.detect_smells(write_sample(tmpdir))
+            full = detector.get_smell_report()
+            summary = detector.get_smell_report(include_smells=False)
+            
+            assert 'smells' not in summary
+            assert len(full['smells']) == 5
+            assert {k: v for k, v in full.items() if k != 'smells'} == summary
+            assert detector.get_summary() == summary
+            assert detector.get_detail() == full['smells']
+    
+    def test_summary_without_building_smells(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample = write_sample(tmpdir)
+            detector = IntelligentSmellDetector()
+            
+            with patch('src.core.smell_detector.CodeSmell', side_effect=AssertionError):
+                assert detector.count_smells(sample) == 5
+                summary = detector.get_smell_report(include_smells=False)
+            
+            assert summary['by_category'] == {'Change Preventer': 1, 'Coupler': 1, 'OO Abuser': 1, 'Dispensable': 1, 'Bloater': 1}
+            assert summary['code_health_score'] == 73.0
+            assert len(detector.smells) == 5
+    
+    def test_project_report_combines_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "pkg").mkdir()
+            smelly = write_sample(tmpdir)
+            clean = str(root / "clean.py")
+            Path(clean).write_text("def clean():\n    return 1\n")
+            other = write_sample(root / "pkg")
+            detector = IntelligentSmellDetector()
+            report = detector.detect_project([smelly, clean, other], include_smells=True)
+            
+            assert report['files_scanned'] == 3
+            assert report['total_smells'] == 10
+            assert report['by_severity'] == {'HIGH': 2, 'MEDIUM': 6, 'LOW': 2}
+            assert report['smells_per_file'] == {smelly: 5, other: 5}
+            assert {s['file'] for s in report['smells']} == {smelly, other}
+            assert 'smells' not in detector.detect_project([clean])
+    
+    def test_code_example_is_built_once(self):
+        calls = []
+        
+        def build():
+            calls.append(1)
+            return "example"
+        
+        smell = CodeSmell("n", "LOW", "c", "d", "f.py", 1, "i", "r", code_example=build)
+        assert smell.code_example == "example"
+        assert smell.code_example == "example"
+        assert calls == [1]
+        assert CodeSmell("n", "LOW", "c", "d", "f.py", 1, "i", "r", "plain").code_example == "plain"
+        assert CodeSmell("n", "LOW", "c", "d", "f.py", 1, "i", "r").code_example == ""
+    
+    def test_nested_function_access_not_counted_twice(self):
+        code = (
+            "def outer(self):\n"
+            "    def inner(order):\n"
+            "        return order.a + order.b + order.c + order.d + order.e + order.f\n"
+            "    return inner\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            smells = detector.detect_smells(write_sample(tmpdir, code))
+            
+            assert [(s.name, s.description) for s in smells if s.category == 'OO Abuser'] == [
+                ('Inappropriate Intimacy', "Function 'inner' accesses other objects' internals 6 times"),
+            ]
+    
+    def test_feature_envy_reports_owners_in_source_order(self):
+        code = (
+            "def envy(self):\n"
+            "    a = order.a + order.b + order.c + order.d + order.e + order.f\n"
+            "    b = cart.a + cart.b + cart.c + cart.d + cart.e + cart.f\n"
+            "    return a, b\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            smells = IntelligentSmellDetector().detect_smells(write_sample(tmpdir, code))
+            
+            assert [s.description for s in smells if s.name == 'Feature Envy'] == [
+                "Function 'envy' uses 'order' more than 'self'",
+                "Function 'envy' uses 'cart' more than 'self'",
+            ]
+    
+    def test_unchanged_file_is_not_reparsed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample = write_sample(tmpdir)
+            first = IntelligentSmellDetector().detect_smells(sample)
+            
+            with patch('src.core.smell_detector.ast.parse', side_effect=AssertionError):
+                second = IntelligentSmellDetector().detect_smells(sample)
+            
+            assert second == first
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_smells_have_no_instance_dict(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            smells = IntelligentSmellDetector().detect_smells(write_sample(tmpdir))
+            
+            assert smells and not any(hasattr(s, '__dict__') for s in smells)
+    
+    def test_reused_detector_reports_only_last_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as otherdir:
+            detector = IntelligentSmellDetector()
+            detector.detect_smells(write_sample(tmpdir))
+            detector.detect_smells(write_sample(otherdir, "def clean():\n    return 1\n"))
+            
+            assert detector.smells == []
+            assert detector.get_smell_report()['total_smells'] == 0
+    
+    def test_batch_matches_single_file_detection(self):
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as otherdir:
+            paths = [write_sample(tmpdir), write_sample(otherdir, "def clean():\n    return 1\n")]
+            results = detect_smells_batch(paths, workers=2)
+            
+            assert list(results) == paths
+            assert results[paths[0]] == IntelligentSmellDetector().detect_smells(paths[0])
+            assert results[paths[1]] == []
+            assert all(s.code_example for s in results[paths[0]])
+            assert detect_smells_batch(paths, workers=1) == results
+            assert detect_smells_batch([]) == {}
+    
+    def test_declared_source_encoding_is_honoured(self):
+        code = "# -*- coding: latin-1 -*-\nclass Caf\u00e9:\n    pass\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample = Path(tmpdir) / "sample.py"
+            sample.write_bytes(code.encode('latin-1'))
+            smells = IntelligentSmellDetector().detect_smells(str(sample))
+            
+            assert [s.description for s in smells] == ["Class 'Caf\u00e9' only has 0 method(s)"]
+    
+    def test_identical_content_is_parsed_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as otherdir:
+            code = SMELLY_CODE + "\n# copy\n"
+            first = IntelligentSmellDetector().detect_smells(write_sample(tmpdir, code))
+            
+            copy = write_sample(otherdir, code)
+            with patch('src.core.smell_detector.ast.parse', side_effect=AssertionError):
+                second = IntelligentSmellDetector().detect_smells(copy)
+            
+            assert [s.name for s in second] == [s.name for s in first]
+            assert {s.location for s in second} == {copy}
+    
+    def test_results_persist_in_cache_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache_dir:
+            sample = write_sample(tmpdir)
+            IntelligentSmellDetector._result_cache.clear()
+            first = IntelligentSmellDetector(cache_dir=cache_dir).detect_smells(sample)
+            assert len(list(Path(cache_dir).glob('*.pickle'))) == 1
+            
+            IntelligentSmellDetector._result_cache.clear()
+            with patch('src.core.smell_detector.ast.parse', side_effect=AssertionError):
+                second = IntelligentSmellDetector(cache_dir=cache_dir).detect_smells(sample)
+            
+            assert second == first
+    
+    def test_huge_and_generated_files_are_not_parsed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sample = write_sample(tmpdir)
+            generated = Path(tmpdir) / "service_pb2.py"
+            generated.write_text(SMELLY_CODE)
+            detector = IntelligentSmellDetector()
+            
+            with patch.object(IntelligentSmellDetector, 'MAX_FILE_BYTES', 100), \
+                    patch('src.core.smell_detector.ast.parse', side_effect=AssertionError):
+                smells = detector.detect_smells(sample)
+                assert detector.detect_smells(str(generated)) == []
+            
+            assert [(s.name, s.line) for s in smells] == [('Huge File', 1)]
+            assert 'sample.py' in smells[0].description
+    
+    def test_syntax_error_returns_no_smells(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            assert detector.detect_smells(write_sample(tmpdir, "def broken(:\n")) == []
+    
+    def test_null_bytes_return_no_smells(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            detector = IntelligentSmellDetector()
+            assert detector.detect_smells(write_sample(tmpdir, "x = 1\0\n")) == []
+    
+    def test_runs_as_script(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = subprocess.run(
+                [sys.executable, smell_detector.__file__, write_sample(tmpdir)],
+                capture_output=True, text=True, cwd=tmpdir,
+            )
+            
+            assert result.returncode == 0, result.stderr
+            assert "Lazy Class" in result.stdout